@@ -76,14 +76,73 @@ class CacheManager:
         except Exception as e:
             logging.error(f"Failed to save cache: {e}")
     
+    def _get_record_cache_path(self) -> Path:
+        """Get the path for the campaign record cache file"""
+        return self.cache_dir / "campaign_records_cache.pkl"
+
+    def load_campaign_records(self, max_age_seconds: int) -> Dict[str, Dict]:
+        """Load cached campaign records that are still within the TTL
+
+        Campaign metadata rarely changes, so records fetched recently can be
+        served locally instead of re-querying Salesforce for every run.
+
+        Args:
+            max_age_seconds: Maximum age before a cached record is considered stale
+
+        Returns:
+            Dictionary mapping campaign Id to its cached record (fresh entries only)
+        """
+        cache_path = self._get_record_cache_path()
+        if not cache_path.exists():
+            return {}
+        try:
+            with open(cache_path, 'rb') as f:
+                cache_data = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"Failed to load campaign record cache: {e}")
+            return {}
+
+        now = datetime.now()
+        fresh = {campaign_id: record
+                 for campaign_id, (record, fetched_at) in cache_data.items()
+                 if (now - fetched_at).total_seconds() < max_age_seconds}
+        logging.info(f"Loaded {len(fresh)} fresh campaign records from cache ({len(cache_data)} total)")
+        return fresh
+
+    def save_campaign_records(self, records: Dict[str, Dict]):
+        """Merge freshly fetched campaign records into the record cache
+
+        Args:
+            records: Dictionary mapping campaign Id to its fetched record
+        """
+        if not records:
+            return
+        cache_path = self._get_record_cache_path()
+        cache_data = {}
+        if cache_path.exists():
+            try:
+                with open(cache_path, 'rb') as f:
+                    cache_data = pickle.load(f)
+            except Exception as e:
+                logging.warning(f"Failed to load campaign record cache for merge: {e}")
+
+        now = datetime.now()
+        for campaign_id, record in records.items():
+            cache_data[campaign_id] = (record, now)
+        try:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(cache_data, f)
+            logging.info(f"Saved {len(records)} campaign records to cache ({len(cache_data)} total)")
+        except Exception as e:
+            logging.error(f"Failed to save campaign record cache: {e}")
+
     def clear_cache(self):
         """Clear the campaign cache"""
-        cache_path = self._get_cache_path()
-        if cache_path.exists():
-            cache_path.unlink()
-            logging.info("Campaign cache cleared successfully")
-        else:
-            logging.info("No cache found to clear")
+        for cache_path in (self._get_cache_path(), self._get_record_cache_path()):
+            if cache_path.exists():
+                cache_path.unlink()
+                logging.info(f"Cleared cache file {cache_path.name}")
+        logging.info("Campaign cache cleared successfully")
     
     def is_cache_compatible(self, requested_member_limit: int, requested_months_back: int = 12) -> bool:
         """Check if existing cache is compatible with requested member limit and months back
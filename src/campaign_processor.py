@@ -24,11 +24,12 @@ class CampaignProcessor:
         self.output_directory = output_directory
         self.processing_stats = {}
         
-        # Initialize components
-        self.salesforce_client = SalesforceClient()
+        # Initialize components - the cache manager is shared with the
+        # Salesforce client so both use the same cache directory
+        self.cache_manager = CacheManager()
+        self.salesforce_client = SalesforceClient(cache_manager=self.cache_manager)
         self.openai_client = OpenAIClient(use_openai=use_openai)
         self.context_manager = ContextManager()
-        self.cache_manager = CacheManager()
         self.excel_generator = ExcelReportGenerator(output_directory=output_directory)
         
         logging.info(f"Campaign processor initialized (OpenAI: {use_openai})")
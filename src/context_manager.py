@@ -676,7 +676,42 @@ class ContextManager:
         else:
             logging.info(f"No outreach sequence routing configured for Channel={channel}, Sub_Channel={sub_channel}")
             return None
-    
+
+    def determine_outreach_sequences_batch(self, campaigns: pd.DataFrame) -> list:
+        """Determine outreach sequences for a whole DataFrame of campaigns
+
+        Only Email and Content Syndication/Content campaigns have routing
+        rules, so the routable rows are selected with boolean masks first and
+        the per-row lookup runs only for those - everything else resolves to
+        None without touching the enrichment pipeline.
+
+        Args:
+            campaigns: DataFrame with campaign data
+
+        Returns:
+            List of sequence info dicts (or None) aligned with row positions
+        """
+        sequences = [None] * len(campaigns)
+        if campaigns.empty or 'Channel__c' not in campaigns.columns:
+            return sequences
+
+        channels = campaigns['Channel__c'].fillna('')
+        if 'Sub_Channel__c' in campaigns.columns:
+            sub_channels = campaigns['Sub_Channel__c'].fillna('')
+        else:
+            sub_channels = pd.Series('', index=campaigns.index)
+
+        routable = (channels == 'Email') | ((channels == 'Content Syndication') & (sub_channels == 'Content'))
+        if not routable.any():
+            return sequences
+
+        positions = routable.to_numpy().nonzero()[0]
+        for pos, campaign in zip(positions, campaigns.iloc[positions].to_dict('records')):
+            sequences[pos] = self.determine_outreach_sequence(campaign)
+
+        return sequences
+
+
     def _extract_ee_size_from_enriched_bmid(self, enriched_bmid: str) -> Optional[str]:
         """Extract EE Size from enriched BMID context
         
@@ -5,7 +5,7 @@ from typing import Dict, List, Optional
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.utils.dataframe import dataframe_to_rows
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
 from openpyxl.worksheet.worksheet import Worksheet
 
 
@@ -35,14 +35,11 @@ class ExcelReportGenerator:
         filename = f"campaign_report_{timestamp}.xlsx"
         output_path = os.path.join(self.output_directory, filename)
         
-        # Process dataframe for display
-        df_display = df.copy()
-        
         # Enhanced column ordering - Raw SF data first, then AI content
         priority_sf_columns = [
             'Id', 'Name', 'Channel__c', 'Type', 'Status', 'IsActive', 'Description'
         ]
-        
+
         additional_sf_columns = [
             'Sub_Channel__c', 'Sub_Channel_Detail__c', 'Integrated_Marketing__c',
             'Intended_Product__c', 'TCP_Campaign__c', 'TCP_Program__c', 'TCP_Theme__c',
@@ -50,41 +47,68 @@ class ExcelReportGenerator:
             'Intended_Country__c', 'Non_Attributable__c', 'Program__c',
             'Short_Description_for_Sales__c', 'Recent_Member_Count'
         ]
-        
-        ai_columns = ['AI_Prompt', 'AI_Sales_Description']
-        
+
+        ai_columns = ['AI_Prompt', 'AI_Prompt_Type', 'AI_Prompt_Context', 'AI_Sales_Description']
+
         # Create final column order
         final_column_order = []
         for col in priority_sf_columns:
-            if col in df_display.columns:
+            if col in df.columns:
                 final_column_order.append(col)
-        
+
         for col in additional_sf_columns:
-            if col in df_display.columns and col not in final_column_order:
+            if col in df.columns and col not in final_column_order:
                 final_column_order.append(col)
-        
+
         # Add AI columns at the end (prompt before description)
         for col in ai_columns:
-            if col in df_display.columns:
+            if col in df.columns:
                 final_column_order.append(col)
-        
-        # Reorder columns
-        df_display = df_display[final_column_order]
+
+        # Column projection for display - nothing below mutates cell values, so
+        # a full df.copy() would only duplicate the string payload
+        df_display = df.loc[:, final_column_order]
         
         # Calculate comprehensive metrics for summary
+        # Each column is scanned once and the resulting counts/masks are reused
+        # below instead of re-scanning per metric
         total_campaigns = len(df)
-        campaigns_with_ai = df['AI_Sales_Description'].notna().sum() if 'AI_Sales_Description' in df.columns else 0
-        campaigns_with_errors = df['AI_Sales_Description'].str.contains('Error generating', na=False).sum() if 'AI_Sales_Description' in df.columns else 0
+        if 'AI_Sales_Description' in df.columns:
+            ai_mask = df['AI_Sales_Description'].notna()
+            # regex=False dispatches to the plain substring kernel instead of
+            # compiling and running a regex per row
+            error_mask = df['AI_Sales_Description'].str.contains('Error generating', na=False, regex=False)
+            campaigns_with_ai = ai_mask.sum()
+            campaigns_with_errors = error_mask.sum()
+        else:
+            ai_mask = None
+            error_mask = None
+            campaigns_with_ai = 0
+            campaigns_with_errors = 0
         success_rate = (campaigns_with_ai / total_campaigns * 100) if total_campaigns > 0 else 0
-        
-        # Average description length (excluding errors)
+
+        # Channel metrics from a single value_counts pass
+        if 'Channel__c' in df.columns:
+            channel_counts = df['Channel__c'].value_counts(dropna=False)
+            unique_channels = int(channel_counts.index.notna().sum())
+            sales_generated_campaigns = int(channel_counts.get('Sales Generated', 0))
+            regular_marketing_campaigns = total_campaigns - sales_generated_campaigns
+        else:
+            unique_channels = 0
+            sales_generated_campaigns = 0
+            regular_marketing_campaigns = 0
+
+        # Unique counts for remaining dimension columns in one call
+        dimension_columns = [col for col in ('Vertical__c', 'Territory__c') if col in df.columns]
+        unique_dimension_counts = df[dimension_columns].nunique() if dimension_columns else {}
+
+        # Average description length (excluding errors), reusing the masks above
         avg_desc_length = 0
-        if 'AI_Sales_Description' in df.columns:
-            descriptions = df['AI_Sales_Description'].dropna().tolist()
-            valid_descriptions = [desc for desc in descriptions if isinstance(desc, str) and 'Error generating' not in desc]
-            if valid_descriptions:
-                avg_desc_length = sum(len(desc) for desc in valid_descriptions) / len(valid_descriptions)
-        
+        if ai_mask is not None:
+            valid_descriptions = df['AI_Sales_Description'][ai_mask & ~error_mask]
+            if not valid_descriptions.empty:
+                avg_desc_length = valid_descriptions.str.len().mean()
+
         # Create enhanced summary DataFrame
         summary_data = {
             'Metric': [
@@ -114,12 +138,12 @@ class ExcelReportGenerator:
                 f"{avg_desc_length:.1f} chars",
                 processing_stats.get('total_members', 'N/A') if processing_stats else 'N/A',
                 processing_stats.get('processing_time_minutes', 'N/A') if processing_stats else 'N/A',
-                df['Channel__c'].nunique() if 'Channel__c' in df.columns else 0,
-                df['Vertical__c'].nunique() if 'Vertical__c' in df.columns else 0,
-                df['Territory__c'].nunique() if 'Territory__c' in df.columns else 0,
+                unique_channels,
+                unique_dimension_counts.get('Vertical__c', 0),
+                unique_dimension_counts.get('Territory__c', 0),
                 df['Non_Attributable__c'].eq(False).sum() if 'Non_Attributable__c' in df.columns else 'N/A',
-                df['Channel__c'].eq('Sales Generated').sum() if 'Channel__c' in df.columns else 0,
-                df['Channel__c'].ne('Sales Generated').sum() if 'Channel__c' in df.columns else 0,
+                sales_generated_campaigns,
+                regular_marketing_campaigns,
                 df['Intended_Product__c'].ne('General').sum() if 'Intended_Product__c' in df.columns else 0,
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ]
@@ -135,38 +159,44 @@ class ExcelReportGenerator:
             # Processing summary sheet
             summary_df.to_excel(writer, sheet_name='Processing Summary', index=False)
             
+            # RingCentral color scheme
+            rc_blue = "0684BC"  # RingCentral blue
+            rc_dark_blue = "045A8D"  # Darker RingCentral blue
+            white = "FFFFFF"
+
+            # Register the branding styles once per workbook - header cells then
+            # reference the shared style records instead of carrying their own
+            # font/fill/alignment copies
+            header_style = NamedStyle(name='rc_header')
+            header_style.font = Font(bold=True, color=white)
+            header_style.fill = PatternFill(start_color=rc_blue, end_color=rc_blue, fill_type="solid")
+            header_style.alignment = Alignment(vertical='center')
+            writer.book.add_named_style(header_style)
+
+            ai_header_style = NamedStyle(name='rc_ai_header')
+            ai_header_style.font = Font(bold=True, color=white)
+            ai_header_style.fill = PatternFill(start_color=rc_dark_blue, end_color=rc_dark_blue, fill_type="solid")
+            ai_header_style.alignment = Alignment(vertical='center')
+            writer.book.add_named_style(ai_header_style)
+
             # Format all sheets with RingCentral branding
             for sheet_name in writer.sheets:
                 worksheet = writer.sheets[sheet_name]
-                
-                # RingCentral color scheme
-                rc_blue = "0684BC"  # RingCentral blue
-                rc_dark_blue = "045A8D"  # Darker RingCentral blue
-                white = "FFFFFF"
-                
+
                 # Format headers
-                header_font = Font(bold=True, color=white)
-                header_fill = PatternFill(start_color=rc_blue, end_color=rc_blue, fill_type="solid")
-                
                 for cell in worksheet[1]:
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(vertical='center')
-                
+                    cell.style = 'rc_header'
+
                 # Set standard row height for all rows
                 for row in worksheet.iter_rows():
                     worksheet.row_dimensions[row[0].row].height = 15
-                
+
                 # For the main Campaign Data sheet, highlight AI columns
                 if sheet_name == 'Campaign Data':
-                    ai_col_fill = PatternFill(start_color=rc_dark_blue, end_color=rc_dark_blue, fill_type="solid")
-                    ai_col_font = Font(bold=True, color=white)
                     for col_idx, col_name in enumerate(final_column_order, 1):
                         if col_name in ai_columns:
-                            cell = worksheet.cell(row=1, column=col_idx)
-                            cell.fill = ai_col_fill
-                            cell.font = ai_col_font
-                    
+                            worksheet.cell(row=1, column=col_idx).style = 'rc_ai_header'
+
                     # Freeze panes at first row and key columns
                     worksheet.freeze_panes = 'E2'  # Freeze first 4 columns (Id, Name, Channel, Type) and header row
                 
@@ -1,112 +1,441 @@
 import os
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import pickle
+import random
+import re
+import tempfile
 import time
-from typing import Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
 import openai
 import pandas as pd
 
+# tiktoken gives exact token counts for rate limiting and length checks;
+# without it the 4-characters-per-token heuristic is used instead
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# httpx ships with the OpenAI SDK and lets us size the shared connection
+# pool; without it the SDK's default pool configuration is used
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+# Prompt templates are built once at import time - only the campaign context
+# varies between calls
+_BASE_PROMPT = ("You are generating a campaign description for a sales rep. "
+                "Use the provided Salesforce campaign metadata to infer campaign purpose, prospect behavior, and recommended rep follow-up. "
+                "CRITICAL FORMATTING: Output exactly 3 lines, each starting with '• ' (bullet + space) followed by the EXACT category label (enclosed in []), then a colon, then your description.\n"
+                "CRITICAL LENGTH: Each bullet should be 100-160 characters.Total response MUST BE UNDER 400 characters.\n"
+                "DO NOT use dashes (-), asterisks (*), bold formatting (**), numbers, or any other bullet style.\n"
+                "NEVER use colons (:) or dashes (-) anywhere in your descriptions - only the single colon after the category label is allowed.\n"
+                "DO NOT REPEAT raw metadata verbatim.\n"
+                "DO NOT REPEAT the campaign name.\n"
+                "Always mention the product interest if it's available.\n"
+                "Be extremely concise - every word must add value.\n"
+                "Write with the goal of helping a sales rep understand the prospect's mindset and how to follow up.\n"
+                "Example format: • [Source]: Selected from high-intent prospect database targeting US market.\n"
+                "If a third-party vendor, partner, or syndication platform is involved in the campaign, EXPLICITLY name them in the description. DO NOT USE vague phrases like “third-party sites.” Clear vendor identification improves sales rep understanding of lead context and credibility of the campaign source. The more specific the engagement details, the more actionable the output becomes. When possible, pull the exact asset name to enhance intent accuracy. This level of specificity helps reps prioritize follow-up and position the product more effectively.\n"
+                "PRIORITIZE information from the Campaign description, Concise sales focused campaign summary, and Business Marketing ID fields. Your goal is to transform technical or unclear descriptions into clear, concise, and sales-ready summaries that highlight what the campaign represents. Ensure that all relevant content from these fields is thoughtfully incorporated and reflected in the final output.\n\n"
+                "Answer these questions for a sales rep:\n")
+
+_SPECIFIC_PROMPTS = {
+    'sales_generated': ("• [Source]: What was the sales sourcing method? Explain why this contact was selected for outreach.\n"
+                        "• [Data Origin]: What is the prospect profile and qualification criteria that made them a target?\n"
+                        "• [Approach]: What are specific cold outreach tactics, timing, and personalization strategies a sales rep should take?\n"
+                        "Focus on the sales context and potential fit not prospect behavior (since they haven't engaged).\n"),
+
+    'partner_referral': ("• [Referral Source]: What type of partner is this and what credibility or context does that provide?\n"
+                         "• [Fit/Alignment]: What does the referral or campaign suggest about product fit, integration needs, or ecosystem alignment?\n"
+                         "• [Leverage]: What is the product being promoted? Explain how to use partner credibility to guide outreach.\n"
+                         "Focus on leveraging the referral trust and highlighting integration or ecosystem relevance.\n"),
+
+    'existing_customer': ("• [Customer Status]: What is the current status of this existing customer?\n"
+                          "• [Exploration]: What is the level of expansion readiness and what specific upsell/cross-sell products could the existing customer be interested in based on current gaps or growth needs?\n"
+                          "• [Framing]: How can the conversation be framed for the conversion as an upsell or expansion opportunity?\n"
+                          "Focus on growth opportunity and product fit based on existing usage.\n"),
+
+    'events': ("• [Participation]: What did the prospect attend? A live event or self submitted interest?\n"
+               "• [Signal]: What does this action suggest about their buying stage and solution priorities based on event engagement?\n"
+               "• [Engagement Style]: How should a sales rep follow up in a relationship driven or consultative way?\n"
+               "Focus on event context and tailoring outreach around shared experience or learning goals.\n"),
+
+    'high_intent': ("• [Search Behavior]: What does the lead's search activity or website visit reveal about their interest or intent?\n"
+                    "• [Trigger]: What keyword or campaign may have triggered the engagement?\n"
+                    "• [Urgency]: How can a sales rep tailor outreach based on urgency or solution comparison?\n"
+                    "Focus on urgency, buyer readiness, and solution fit.\n"),
+
+    'retargeting_nurture': ("• [Engagement]: Why did the prospect engage or how have they been nurtured over time?\n"
+                            "• [Resonance]: What content or messaging likely captured their interest?\n"
+                            "• [Momentum]: How can a sales rep engage them based on slow building awareness or curiosity?\n"
+                            "Focus on gradual intent signals and how to move the conversation forward gently.\n"),
+
+    'awareness_broadcast': ("• [Exposure]: How was the lead passively exposed to a brand campaign or M&A update?\n"
+                            "• [Relevance]: Why was the campaign relevant to them?\n"
+                            "• [Discovery]: How can a sales rep gauge real interest through a light touch outreach?\n"
+                            "Focus on surfacing potential relevance and inviting discovery rather than pushing product.\n"),
+
+    'regular_marketing': ("• [Engagement]: What was the prospect doing when they engaged with this campaign?\n"
+                          "• [Intent/Interest]: Why did the prospect engage (their intent or product interest)?\n"
+                          "• [Next Steps]: What specific action(s) should the rep take now based on this engagement (e.g., how to follow up, what angle to take, or what kind of conversation to initiate)?\n"
+                          "Focus on the prospect's perspective and intent, not marketing terminology.\n"),
+}
+
+# URL preservation instruction for all prompts
+_URL_INSTRUCTION = "\n\nIMPORTANT: If the campaign details mention any URLs or websites, preserve the domain name in your description."
+
+# Fully assembled prompts (base + specific + URL instruction) per prompt type,
+# concatenated once at import time - only the campaign context is appended at
+# call time
+_PROMPT_TEMPLATES = {
+    prompt_type: f"{_BASE_PROMPT}{specific_prompt}{_URL_INSTRUCTION}\n\nCampaign Information:\n"
+    for prompt_type, specific_prompt in _SPECIFIC_PROMPTS.items()
+}
+
+# The static instructions ship as the system message so OpenAI's prompt
+# caching can reuse the prefix across requests; only the campaign context
+# travels in the user message
+_SYSTEM_ROLE = "You are a sales enablement expert who helps salespeople understand prospect intent and behavior."
+
+_SYSTEM_PROMPTS = {
+    prompt_type: f"{_SYSTEM_ROLE}\n\n{_BASE_PROMPT}{specific_prompt}{_URL_INSTRUCTION}"
+    for prompt_type, specific_prompt in _SPECIFIC_PROMPTS.items()
+}
+
+# Template lengths cached alongside the templates so the per-call token
+# estimate only measures the (variable) context
+_PROMPT_TEMPLATE_LENS = {prompt_type: len(template)
+                         for prompt_type, template in _PROMPT_TEMPLATES.items()}
+
+@functools.lru_cache(maxsize=None)
+def _get_encoder(model: str):
+    """Get the tiktoken encoder for a model, or None if tiktoken is absent
+
+    Args:
+        model: OpenAI model name
+
+    Returns:
+        Cached tiktoken encoding, or None when tiktoken is not installed
+    """
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('cl100k_base')
+
+
+@functools.lru_cache(maxsize=None)
+def _template_token_len(model: str, prompt_type: str) -> int:
+    """Count the tokens in a prompt template once per (model, type) pair
+
+    Args:
+        model: OpenAI model name
+        prompt_type: Prompt type selecting the template
+
+    Returns:
+        Exact token count of the static template portion
+    """
+    template = _PROMPT_TEMPLATES.get(prompt_type, _PROMPT_TEMPLATES['regular_marketing'])
+    return len(_get_encoder(model).encode(template))
+
+
+# BMID keywords that flag a campaign as targeting an existing customer
+_EXISTING_CUSTOMER_BMID_RE = re.compile(r"cm|pendo|upsell|adoption", re.IGNORECASE)
+
+# Keywords that indicate critical handling instructions, compiled into one
+# case-insensitive pattern so each field is scanned once
+_CRITICAL_RE = re.compile(
+    r"MUST READ|IMPORTANT|CRITICAL|ATTENTION|WARNING|REQUIRED|MANDATORY|URGENT|\*\*\*|!!!",
+    re.IGNORECASE
+)
+
+# Fields checked for critical instructions, as (column, display name) pairs
+_CRITICAL_FIELDS = [
+    ('Description', 'Campaign Description'),
+    ('Short_Description_for_Sales__c', 'Concise Sales Summary')
+]
+
+
+@functools.lru_cache(maxsize=4096)
+def _has_critical(text: str) -> bool:
+    """Check whether text contains critical instruction keywords
+
+    Memoized because campaign descriptions are frequently duplicated across
+    rows of a Salesforce export.
+
+    Args:
+        text: Field value to scan
+
+    Returns:
+        True if any critical keyword is present
+    """
+    return bool(_CRITICAL_RE.search(text))
+
+# Channel routing flattened into a single lookup table built once at import
+# time - _get_prompt_type does one dict probe instead of scanning eight lists
+_CHANNEL_GROUPS = {
+    'sales_generated': [
+        "sales generated", "list purchase", "appointment setting",
+        "sales agents & resellers", "default", "other"
+    ],
+    'partner_referral': [
+        "var campaigns", "var mdf", "affiliates", "isv", "sia",
+        "franchise & assoc.", "service providers", "amazon", "referrals"
+    ],
+    'existing_customer': ["upsell"],
+    'events': ["corporate events", "field events", "events", "walk-on"],
+    'high_intent': ["paid search", "organic search"],
+    'retargeting_nurture': [
+        "retargeting", "prospect nurturing", "digital", "leadgen", "social media"
+    ],
+    'awareness_broadcast': ["media campaigns", "mergers & acquisitions"],
+    'regular_marketing': [
+        "content syndication", "web partners", "vendor qualified leads",
+        "email", "direct mail"
+    ],
+}
+
+_CHANNEL_TO_PROMPT_TYPE = {channel: prompt_type
+                           for prompt_type, channels in _CHANNEL_GROUPS.items()
+                           for channel in channels}
+
+
+class _AsyncTokenBucket:
+    """Token bucket limiting request throughput to a per-minute budget
+
+    Tokens refill continuously at the configured rate; acquire() waits until
+    enough tokens are available. State is plain floats mutated without an
+    intervening await, so it is safe under cooperative asyncio scheduling and
+    survives across event loops between batches.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        """Initialize the bucket
+
+        Args:
+            rate_per_minute: Sustained budget per minute (requests or tokens)
+        """
+        self._rate = rate_per_minute / 60.0
+        self._capacity = rate_per_minute
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, amount: float = 1.0):
+        """Wait until the requested amount can be drawn from the bucket
+
+        Args:
+            amount: Number of tokens to draw (capped at bucket capacity)
+        """
+        amount = min(amount, self._capacity)
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= amount:
+                self._tokens -= amount
+                return
+            await asyncio.sleep(max((amount - self._tokens) / self._rate, 0.01))
+
 
 class OpenAIClient:
     """Handles OpenAI API interactions for generating campaign descriptions"""
-    
-    def __init__(self, use_openai: bool = True):
+
+    # Maximum retry attempts for rate-limited requests
+    MAX_RETRIES = 5
+
+    # Streamed responses are aborted once this many characters have arrived -
+    # the prompt instructs the model to stay under 400 characters, so anything
+    # beyond that is tokens we would pay for and then discard
+    MAX_DESCRIPTION_CHARS = 400
+
+    # Sampling temperature for all completion requests - low for consistent,
+    # factual summaries
+    TEMPERATURE = 0.3
+
+    def __init__(self, use_openai: bool = True, max_concurrent_requests: int = 20,
+                 use_batch_api: bool = False, cache_responses: bool = True,
+                 batch_prompts_per_request: int = 1):
         """Initialize OpenAI client
-        
+
         Args:
             use_openai: If False, will generate prompts without calling OpenAI
+            max_concurrent_requests: Maximum number of in-flight OpenAI requests per batch
+            use_batch_api: Route bulk runs through the OpenAI Batch API (50% cost,
+                up to 24h turnaround) instead of live completions
+            cache_responses: Reuse generated descriptions for duplicate
+                (prompt type, context) pairs; disable for fresh stochastic output
+            batch_prompts_per_request: Pack this many campaigns of the same
+                prompt type into one completion request (1 disables packing);
+                useful when the account is limited on requests rather than tokens
         """
         self.use_openai = use_openai
+        self.max_concurrent_requests = max_concurrent_requests
+        self.use_batch_api = use_batch_api
+        self.cache_responses = cache_responses
+        self.batch_prompts_per_request = batch_prompts_per_request
+        self.model = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')
+
+        # Request- and token-per-minute budgets for the token-bucket limiters -
+        # tune to the account's OpenAI tier via the OPENAI_RPM/OPENAI_TPM env vars
+        self.requests_per_minute = int(os.getenv('OPENAI_RPM', '3000'))
+        self.tokens_per_minute = int(os.getenv('OPENAI_TPM', '90000'))
+
+        # Per-request timeout - a hung connection should fail fast and retry
+        # rather than stall its semaphore slot for the SDK's 10-minute default
+        self.request_timeout = float(os.getenv('OPENAI_TIMEOUT', '15'))
+        self._rate_limiter = _AsyncTokenBucket(self.requests_per_minute)
+        self._token_limiter = _AsyncTokenBucket(self.tokens_per_minute)
         self.client: Optional[openai.OpenAI] = None
+        self.async_client: Optional[openai.AsyncOpenAI] = None
+
+        # Response cache keyed on (prompt_type, context hash) so duplicate
+        # campaigns never pay for a second API call; persisted across runs
+        self._response_cache: dict = {}
+        self._response_cache_dirty = False
+
+        # Lazily constructed ContextManager shared by all outreach-sequence
+        # lookups - constructing one per campaign re-reads the mapping file
+        self._outreach_cm = None
+
         if self.use_openai:
             self.client = self._setup_openai()
+            self.async_client = self._setup_async_openai()
+            if self.cache_responses:
+                self._response_cache = self._load_response_cache()
         else:
             logging.info("Running in prompt preview mode - OpenAI calls disabled")
-    
+
     def _setup_openai(self) -> openai.OpenAI:
         """Setup OpenAI client"""
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             raise ValueError("OPENAI_API_KEY not found in environment variables")
-        return openai.OpenAI(api_key=api_key)
+        return openai.OpenAI(api_key=api_key, timeout=self.request_timeout)
+
+    def _setup_async_openai(self) -> openai.AsyncOpenAI:
+        """Setup async OpenAI client for concurrent batch processing
+
+        The underlying HTTP pool keeps one warm connection per semaphore slot
+        so concurrent requests never queue on the transport or pay TLS
+        handshakes mid-run.
+        """
+        api_key = os.getenv('OPENAI_API_KEY')
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment variables")
+        http_client = None
+        if httpx is not None:
+            http_client = openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=self.max_concurrent_requests,
+                                    max_keepalive_connections=self.max_concurrent_requests))
+        return openai.AsyncOpenAI(api_key=api_key, timeout=self.request_timeout,
+                                  http_client=http_client)
+
+    def _response_cache_path(self) -> str:
+        """Get the path for the persistent response cache file"""
+        project_root = os.path.dirname(os.path.dirname(__file__))
+        return os.path.join(project_root, 'cache', 'openai_response_cache.pkl')
+
+    def _load_response_cache(self) -> dict:
+        """Load previously generated descriptions from disk
+
+        Returns:
+            Dictionary mapping (prompt_type, context hash) to raw descriptions
+        """
+        cache_path = self._response_cache_path()
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    cache = pickle.load(f)
+                logging.info(f"Loaded {len(cache)} cached OpenAI responses from {cache_path}")
+                return cache
+            except Exception as e:
+                logging.warning(f"Failed to load OpenAI response cache: {e}")
+        return {}
+
+    def _save_response_cache(self):
+        """Persist newly generated descriptions to disk for reuse across runs"""
+        if not self._response_cache_dirty:
+            return
+        cache_path = self._response_cache_path()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(self._response_cache, f)
+            self._response_cache_dirty = False
+            logging.info(f"Saved {len(self._response_cache)} OpenAI responses to cache")
+        except Exception as e:
+            logging.error(f"Failed to save OpenAI response cache: {e}")
+
+    def _response_cache_key(self, prompt_type: str, context: str) -> Tuple[str, str]:
+        """Build the cache key for a generated description
+
+        The model and temperature are folded into the digest so cached
+        descriptions are not reused after switching models or retuning the
+        sampling parameters.
+
+        Args:
+            prompt_type: Prompt type determined for the campaign
+            context: Enriched campaign context
+
+        Returns:
+            Tuple of prompt type and SHA-1 hex digest of the request identity
+        """
+        identity = f"{self.model}\x00{self.TEMPERATURE}\x00{context}"
+        return prompt_type, hashlib.sha1(identity.encode('utf-8')).hexdigest()
     
-    def _get_prompt_type(self, campaign: pd.Series) -> str:
+    def _get_prompt_type(self, campaign: Union[pd.Series, Dict]) -> str:
         """Determine the appropriate prompt type based on BMID__c keywords first, then Channel__c value
         
         Args:
-            campaign: Campaign data as pandas Series
+            campaign: Campaign data as pandas Series or plain dict
             
         Returns:
             Prompt type string
         """
         # First check BMID__c for existing customer keywords (case insensitive)
         bmid = campaign.get('BMID__c', '') or ''
-        bmid = bmid.strip()
-        if bmid:
-            bmid_lower = bmid.lower()
-            existing_customer_keywords = ['cm', 'pendo', 'upsell', 'adoption']
-            
-            # Check if any existing customer keyword is contained in BMID
-            for keyword in existing_customer_keywords:
-                if keyword in bmid_lower:
-                    return 'existing_customer'
-        
-        # Fall back to channel-based routing
-        channel = campaign.get('Channel__c', '') or ''
-        channel = channel.strip()
-        if not channel:
-            return 'regular_marketing'
-        
-        # Use case-insensitive matching
-        channel_lower = channel.lower()
-        
-        # Define channel mappings
-        sales_generated_channels = [
-            "sales generated", "list purchase", "appointment setting", 
-            "sales agents & resellers", "default", "other"
-        ]
-        
-        partner_referral_channels = [
-            "var campaigns", "var mdf", "affiliates", "isv", "sia", 
-            "franchise & assoc.", "service providers", "amazon", "referrals"
-        ]
-        
-        existing_customer_channels = ["upsell"]
-        
-        events_channels = ["corporate events", "field events", "events", "walk-on"]
-        
-        high_intent_channels = ["paid search", "organic search"]
-        
-        retargeting_nurture_channels = [
-            "retargeting", "prospect nurturing", "digital", "leadgen", "social media"
-        ]
-        
-        awareness_broadcast_channels = ["media campaigns", "mergers & acquisitions"]
-        
-        regular_marketing_channels = [
-            "content syndication", "web partners", "vendor qualified leads", 
-            "email", "direct mail"
-        ]
-        
-        # Check each category in order
-        if channel_lower in sales_generated_channels:
-            return 'sales_generated'
-        elif channel_lower in partner_referral_channels:
-            return 'partner_referral'
-        elif channel_lower in existing_customer_channels:
+        if isinstance(bmid, str) and _EXISTING_CUSTOMER_BMID_RE.search(bmid):
             return 'existing_customer'
-        elif channel_lower in events_channels:
-            return 'events'
-        elif channel_lower in high_intent_channels:
-            return 'high_intent'
-        elif channel_lower in retargeting_nurture_channels:
-            return 'retargeting_nurture'
-        elif channel_lower in awareness_broadcast_channels:
-            return 'awareness_broadcast'
-        elif channel_lower in regular_marketing_channels:
+
+        # Fall back to channel-based routing via the precomputed lookup table
+        channel = campaign.get('Channel__c', '') or ''
+        if not isinstance(channel, str):
             return 'regular_marketing'
+        return _CHANNEL_TO_PROMPT_TYPE.get(channel.strip().lower(), 'regular_marketing')
+
+    def _assign_prompt_types(self, df: pd.DataFrame) -> pd.Series:
+        """Determine prompt types for a whole DataFrame in one vectorized pass
+
+        Applies the same BMID-then-channel routing as _get_prompt_type using
+        column-level string operations instead of a Python call per row.
+
+        Args:
+            df: DataFrame with campaign data
+
+        Returns:
+            Series of prompt type strings aligned with df's index
+        """
+        if 'Channel__c' in df.columns:
+            channels = df['Channel__c'].fillna('').str.strip().str.lower()
+            prompt_types = channels.map(_CHANNEL_TO_PROMPT_TYPE).fillna('regular_marketing')
         else:
-            # Default fallback
-            return 'regular_marketing'
+            prompt_types = pd.Series('regular_marketing', index=df.index)
+
+        if 'BMID__c' in df.columns:
+            is_existing = df['BMID__c'].fillna('').str.contains(_EXISTING_CUSTOMER_BMID_RE)
+            prompt_types = prompt_types.mask(is_existing, 'existing_customer')
+
+        return prompt_types
     
     def _get_tailored_prompt(self, prompt_type: str, context: str) -> str:
         """Get the appropriate prompt based on prompt type
@@ -118,148 +447,344 @@ class OpenAIClient:
         Returns:
             Formatted prompt string
         """
-        base_prompt = ("You are generating a campaign description for a sales rep. "
-                       "Use the provided Salesforce campaign metadata to infer campaign purpose, prospect behavior, and recommended rep follow-up. "
-                       "CRITICAL FORMATTING: Output exactly 3 lines, each starting with '• ' (bullet + space) followed by the EXACT category label (enclosed in []), then a colon, then your description.\n"
-                       "CRITICAL LENGTH: Each bullet should be 100-160 characters.Total response MUST BE UNDER 400 characters.\n"
-                       "DO NOT use dashes (-), asterisks (*), bold formatting (**), numbers, or any other bullet style.\n"
-                       "NEVER use colons (:) or dashes (-) anywhere in your descriptions - only the single colon after the category label is allowed.\n"
-                       "DO NOT REPEAT raw metadata verbatim.\n"
-                       "DO NOT REPEAT the campaign name.\n"
-                       "Always mention the product interest if it's available.\n"
-                       "Be extremely concise - every word must add value.\n"
-                       "Write with the goal of helping a sales rep understand the prospect's mindset and how to follow up.\n"
-                       "Example format: • [Source]: Selected from high-intent prospect database targeting US market.\n"
-                       "If a third-party vendor, partner, or syndication platform is involved in the campaign, EXPLICITLY name them in the description. DO NOT USE vague phrases like “third-party sites.” Clear vendor identification improves sales rep understanding of lead context and credibility of the campaign source. The more specific the engagement details, the more actionable the output becomes. When possible, pull the exact asset name to enhance intent accuracy. This level of specificity helps reps prioritize follow-up and position the product more effectively.\n"
-                       "PRIORITIZE information from the Campaign description, Concise sales focused campaign summary, and Business Marketing ID fields. Your goal is to transform technical or unclear descriptions into clear, concise, and sales-ready summaries that highlight what the campaign represents. Ensure that all relevant content from these fields is thoughtfully incorporated and reflected in the final output.\n\n"
-                       "Answer these questions for a sales rep:\n")
-        
-        if prompt_type == 'sales_generated':
-            specific_prompt = ("• [Source]: What was the sales sourcing method? Explain why this contact was selected for outreach.\n"
-                             "• [Data Origin]: What is the prospect profile and qualification criteria that made them a target?\n"
-                             "• [Approach]: What are specific cold outreach tactics, timing, and personalization strategies a sales rep should take?\n"
-                             "Focus on the sales context and potential fit not prospect behavior (since they haven't engaged).\n")
-        
-        elif prompt_type == 'partner_referral':
-            specific_prompt = ("• [Referral Source]: What type of partner is this and what credibility or context does that provide?\n"
-                             "• [Fit/Alignment]: What does the referral or campaign suggest about product fit, integration needs, or ecosystem alignment?\n"
-                             "• [Leverage]: What is the product being promoted? Explain how to use partner credibility to guide outreach.\n"
-                             "Focus on leveraging the referral trust and highlighting integration or ecosystem relevance.\n")
-        
-        elif prompt_type == 'existing_customer':
-            specific_prompt = ("• [Customer Status]: What is the current status of this existing customer?\n"
-                             "• [Exploration]: What is the level of expansion readiness and what specific upsell/cross-sell products could the existing customer be interested in based on current gaps or growth needs?\n"
-                             "• [Framing]: How can the conversation be framed for the conversion as an upsell or expansion opportunity?\n"
-                             "Focus on growth opportunity and product fit based on existing usage.\n")
-        
-        elif prompt_type == 'events':
-            specific_prompt = ("• [Participation]: What did the prospect attend? A live event or self submitted interest?\n"
-                             "• [Signal]: What does this action suggest about their buying stage and solution priorities based on event engagement?\n"
-                             "• [Engagement Style]: How should a sales rep follow up in a relationship driven or consultative way?\n"
-                             "Focus on event context and tailoring outreach around shared experience or learning goals.\n")
-        
-        elif prompt_type == 'high_intent':
-            specific_prompt = ("• [Search Behavior]: What does the lead's search activity or website visit reveal about their interest or intent?\n"
-                             "• [Trigger]: What keyword or campaign may have triggered the engagement?\n"
-                             "• [Urgency]: How can a sales rep tailor outreach based on urgency or solution comparison?\n"
-                             "Focus on urgency, buyer readiness, and solution fit.\n")
-        
-        elif prompt_type == 'retargeting_nurture':
-            specific_prompt = ("• [Engagement]: Why did the prospect engage or how have they been nurtured over time?\n"
-                             "• [Resonance]: What content or messaging likely captured their interest?\n"
-                             "• [Momentum]: How can a sales rep engage them based on slow building awareness or curiosity?\n"
-                             "Focus on gradual intent signals and how to move the conversation forward gently.\n")
-        
-        elif prompt_type == 'awareness_broadcast':
-            specific_prompt = ("• [Exposure]: How was the lead passively exposed to a brand campaign or M&A update?\n"
-                             "• [Relevance]: Why was the campaign relevant to them?\n"
-                             "• [Discovery]: How can a sales rep gauge real interest through a light touch outreach?\n"
-                             "Focus on surfacing potential relevance and inviting discovery rather than pushing product.\n")
-        
-        else:  # regular_marketing (default)
-            specific_prompt = ("• [Engagement]: What was the prospect doing when they engaged with this campaign?\n"
-                             "• [Intent/Interest]: Why did the prospect engage (their intent or product interest)?\n"
-                             "• [Next Steps]: What specific action(s) should the rep take now based on this engagement (e.g., how to follow up, what angle to take, or what kind of conversation to initiate)?\n"
-                             "Focus on the prospect's perspective and intent, not marketing terminology.\n")
-        
-        # Add URL preservation instruction for all prompts
-        url_instruction = "\n\nIMPORTANT: If the campaign details mention any URLs or websites, preserve the domain name in your description."
-        
-        return f"{base_prompt}{specific_prompt}{url_instruction}\n\nCampaign Information:\n{context}"
+        template = _PROMPT_TEMPLATES.get(prompt_type, _PROMPT_TEMPLATES['regular_marketing'])
+        return template + context
+
+    def reconstruct_prompt(self, row: Union[pd.Series, Dict]) -> str:
+        """Rebuild the full prompt for a processed campaign row
+
+        Batch output stores only AI_Prompt_Type and AI_Prompt_Context; the
+        static template portion is re-attached here for consumers that need
+        the complete prompt text.
+
+        Args:
+            row: Processed campaign row with AI_Prompt_Type and AI_Prompt_Context
+
+        Returns:
+            Full prompt string as it was sent to OpenAI
+        """
+        return self._get_tailored_prompt(row.get('AI_Prompt_Type', 'regular_marketing'),
+                                         row.get('AI_Prompt_Context', '') or '')
 
-    def generate_description(self, campaign: pd.Series, context: str) -> Tuple[str, str]:
+    def generate_description(self, campaign: Union[pd.Series, Dict], context: str,
+                             prompt_type: Optional[str] = None,
+                             sequence_info: Optional[Dict] = None,
+                             sequence_known: bool = False) -> Tuple[str, str]:
         """Generate AI description for a single campaign
-        
+
         Args:
-            campaign: Campaign data as pandas Series
+            campaign: Campaign data as pandas Series or plain dict
             context: Enriched context string
-            
+            prompt_type: Precomputed prompt type (derived from the campaign if omitted)
+            sequence_info: Precomputed outreach sequence for the campaign
+            sequence_known: Whether sequence_info was precomputed (None is a
+                valid precomputed result, hence the separate flag)
+
         Returns:
             tuple: (description, prompt) - description is the AI response or preview text,
                    prompt is the full prompt that would be sent to OpenAI
         """
         # Determine prompt type based on Channel__c
-        prompt_type = self._get_prompt_type(campaign)
-        
+        if prompt_type is None:
+            prompt_type = self._get_prompt_type(campaign)
+
         # Get tailored prompt
         prompt = self._get_tailored_prompt(prompt_type, context)
-        
+
+        precomputed = None
+        if sequence_known:
+            precomputed = (self._detect_critical_fields(campaign), sequence_info)
+
         if not self.use_openai or self.client is None:
-            # Return preview mode response
-            campaign_name = campaign.get('Name', 'Unknown')
-            if campaign_name is not None:
-                preview_description = f"[PROMPT PREVIEW MODE - {prompt_type.upper()}] Campaign: {campaign_name[:50]}..."
-            else:
-                preview_description = f"[PROMPT PREVIEW MODE - {prompt_type.upper()}] Campaign: Unknown..."
-            
-            # Check for critical instructions and append alert even in preview mode
-            preview_description = self._append_critical_alert(campaign, preview_description)
-            
-            # Check for outreach sequence and append even in preview mode
-            preview_description = self._append_outreach_sequence(campaign, preview_description)
-            
-            return preview_description, prompt
-        
-        # Check if prompt is too long (rough estimate: 1 token ≈ 4 characters)
-        estimated_tokens = len(prompt) // 4
-        if estimated_tokens > 3500:  # Leave room for response tokens
-            logging.warning(f"Prompt may be too long ({estimated_tokens} estimated tokens). Consider reducing campaign context.")
-        
+            return self._preview_description(campaign, prompt_type, precomputed), prompt
+
+        # Duplicate contexts reuse the cached response instead of a new API call
+        if self.cache_responses:
+            cache_key = self._response_cache_key(prompt_type, context)
+            cached_description = self._response_cache.get(cache_key)
+            if cached_description is not None:
+                logging.debug("Using cached description for campaign %s", campaign.get('Id'))
+                return self._finalize_description(campaign, cached_description, precomputed), prompt
+
+        self._check_prompt_length(prompt_type, context)
+
         try:
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a sales enablement expert who helps salespeople understand prospect intent and behavior."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=120,
-                temperature=0.3
-            )
-            
-            description = response.choices[0].message.content
-            if description is None:
-                description = "No description generated"
-            else:
-                description = description.strip()
-            
-            # Check for critical instructions and append alert if needed
-            description = self._append_critical_alert(campaign, description)
-            
-            # Check for outreach sequence and append if needed
-            description = self._append_outreach_sequence(campaign, description)
-            
-            return description, prompt
-            
+                **self._completion_kwargs(prompt_type, f"Campaign Information:\n{context}"))
+            description = self._extract_content(response)
+            if self.cache_responses:
+                self._response_cache[cache_key] = description
+                self._response_cache_dirty = True
+            return self._finalize_description(campaign, description, precomputed), prompt
+
         except Exception as e:
             logging.error(f"Failed to generate description for campaign {campaign.get('Id')}: {e}")
             return "Error generating description", prompt
-    
+
+    async def _generate_description_async(self, campaign: Union[pd.Series, Dict], context: str,
+                                          semaphore: asyncio.Semaphore,
+                                          prompt_type: Optional[str] = None,
+                                          sequence_info: Optional[Dict] = None,
+                                          sequence_known: bool = False) -> Tuple[str, str]:
+        """Generate AI description for a single campaign using the async client
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+            context: Enriched context string
+            semaphore: Semaphore bounding concurrent in-flight requests
+            prompt_type: Precomputed prompt type (derived from the campaign if omitted)
+            sequence_info: Precomputed outreach sequence for the campaign
+            sequence_known: Whether sequence_info was precomputed
+
+        Returns:
+            tuple: (description, prompt) - same contract as generate_description
+        """
+        if prompt_type is None:
+            prompt_type = self._get_prompt_type(campaign)
+        prompt = self._get_tailored_prompt(prompt_type, context)
+
+        async def precompute():
+            if sequence_known:
+                return await asyncio.to_thread(self._detect_critical_fields, campaign), sequence_info
+            return await asyncio.to_thread(self._precompute_appends, campaign)
+
+        # Duplicate contexts reuse the cached response instead of a new API call
+        if self.cache_responses:
+            cache_key = self._response_cache_key(prompt_type, context)
+            cached_description = self._response_cache.get(cache_key)
+            if cached_description is not None:
+                logging.debug("Using cached description for campaign %s", campaign.get('Id'))
+                return self._finalize_description(campaign, cached_description, await precompute()), prompt
+
+        self._check_prompt_length(prompt_type, context)
+
+        # Run the alert/sequence detection in a worker thread while response
+        # tokens stream in, hiding its cost behind the network wait
+        append_task = asyncio.create_task(precompute())
+
+        async with semaphore:
+            try:
+                description = await self._create_completion_with_retry(prompt_type, context)
+            except Exception as e:
+                logging.error(f"Failed to generate description for campaign {campaign.get('Id')}: {e}")
+                await append_task
+                return "Error generating description", prompt
+
+        description = description.strip() or "No description generated"
+        if self.cache_responses:
+            self._response_cache[cache_key] = description
+            self._response_cache_dirty = True
+
+        return self._finalize_description(campaign, description, precomputed=await append_task), prompt
+
+    async def _create_completion_with_retry(self, prompt_type: str, context: str) -> str:
+        """Stream a chat completion with backoff on transient API errors
+
+        Retries rate limits, timeouts, and dropped connections; anything else
+        (auth failures, bad requests) propagates immediately.
+
+        Args:
+            prompt_type: Prompt type selecting the static system message
+            context: Enriched campaign context
+
+        Returns:
+            Raw description text accumulated from the stream
+        """
+        delay = 1.0
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                return await self._stream_completion(prompt_type, context)
+            except (openai.RateLimitError, openai.APIConnectionError) as e:
+                # APITimeoutError is a subclass of APIConnectionError, so the
+                # request_timeout deadline lands here too
+                if attempt == self.MAX_RETRIES - 1:
+                    raise
+                # Prefer the server's own Retry-After hint over blind backoff -
+                # it reflects when the quota window actually resets
+                wait_time = self._retry_after_seconds(e) if isinstance(e, openai.RateLimitError) else None
+                if wait_time is None:
+                    wait_time = delay + random.uniform(0, delay)
+                logging.warning(f"{type(e).__name__} from OpenAI - retrying in {wait_time:.1f}s (attempt {attempt + 1}/{self.MAX_RETRIES})")
+                await asyncio.sleep(wait_time)
+                delay = min(delay * 2, 60)
+
+    @staticmethod
+    def _retry_after_seconds(error: openai.RateLimitError) -> Optional[float]:
+        """Extract the server-advised wait from a rate limit error, if any
+
+        Args:
+            error: Rate limit error raised by the OpenAI SDK
+
+        Returns:
+            Seconds to wait per the Retry-After header, capped at 60, or None
+            if the header is absent or unparseable
+        """
+        try:
+            retry_after = error.response.headers.get('retry-after')
+            if retry_after is not None:
+                return min(max(float(retry_after), 0.0), 60.0)
+        except (AttributeError, ValueError):
+            pass
+        return None
+
+    async def _stream_completion(self, prompt_type: str, context: str) -> str:
+        """Stream completion tokens, terminating early once the length cap is hit
+
+        Args:
+            prompt_type: Prompt type selecting the static system message
+            context: Enriched campaign context
+
+        Returns:
+            Accumulated description text
+        """
+        # Draw one request from the RPM bucket and the estimated token cost
+        # (prompt estimate plus response budget) from the TPM bucket
+        await self._rate_limiter.acquire()
+        await self._token_limiter.acquire(self._estimate_prompt_tokens(prompt_type, context) + 120)
+
+        stream = await self.async_client.chat.completions.create(
+            **self._completion_kwargs(prompt_type, f"Campaign Information:\n{context}"), stream=True
+        )
+
+        chunks = []
+        received = 0
+        try:
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    chunks.append(delta)
+                    received += len(delta)
+                    if received >= self.MAX_DESCRIPTION_CHARS:
+                        # The response already exceeds the enforced length cap -
+                        # stop paying for further tokens
+                        break
+        finally:
+            await stream.close()
+
+        return ''.join(chunks)
+
+    def _completion_kwargs(self, prompt_type: str, user_content: str) -> dict:
+        """Build the keyword arguments for a chat completion request
+
+        Args:
+            prompt_type: Prompt type selecting the static system message
+            user_content: Per-campaign user message content
+
+        Returns:
+            Dictionary of chat.completions.create arguments
+        """
+        system_prompt = _SYSTEM_PROMPTS.get(prompt_type, _SYSTEM_PROMPTS['regular_marketing'])
+        return {
+            'model': self.model,
+            'messages': [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": user_content
+                }
+            ],
+            'max_tokens': 120,
+            'temperature': self.TEMPERATURE,
+            # The format mandates exactly 3 single-spaced bullet lines, so a
+            # blank line means the answer is done - stop there instead of
+            # paying for trailing commentary the length cap would discard
+            'stop': ['\n\n'],
+            # Requests sharing a prompt type share their static system prefix,
+            # so route them to the same cache shard for better prefix reuse
+            'prompt_cache_key': prompt_type
+        }
+
+    def _estimate_prompt_tokens(self, prompt_type: str, context: str) -> int:
+        """Count prompt tokens exactly when tiktoken is available
+
+        The static template portion is encoded once per (model, type) pair and
+        cached; only the variable context is encoded per call. Falls back to
+        the 1 token ≈ 4 characters heuristic when tiktoken is not installed.
+
+        Args:
+            prompt_type: Prompt type selecting the static system message
+            context: Enriched campaign context
+
+        Returns:
+            Token count for the full prompt (template plus context)
+        """
+        encoder = _get_encoder(self.model)
+        if encoder is None:
+            template_len = _PROMPT_TEMPLATE_LENS.get(prompt_type, _PROMPT_TEMPLATE_LENS['regular_marketing'])
+            return (template_len + len(context)) // 4
+        return _template_token_len(self.model, prompt_type) + len(encoder.encode(context))
+
+    def _check_prompt_length(self, prompt_type: str, context: str):
+        """Warn if prompt is too long"""
+        estimated_tokens = self._estimate_prompt_tokens(prompt_type, context)
+        if estimated_tokens > 3500:  # Leave room for response tokens
+            logging.warning(f"Prompt may be too long ({estimated_tokens} estimated tokens). Consider reducing campaign context.")
+
+    def _preview_description(self, campaign: Union[pd.Series, Dict], prompt_type: str,
+                             precomputed: Optional[Tuple[List[str], Optional[Dict]]] = None) -> str:
+        """Build the preview mode description with alerts and sequences appended
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+            prompt_type: Prompt type determined for the campaign
+            precomputed: Detection results from _precompute_appends, if available
+
+        Returns:
+            Preview description string
+        """
+        campaign_name = campaign.get('Name', 'Unknown')
+        if not isinstance(campaign_name, str):
+            # Covers missing names stored as None or NaN
+            campaign_name = 'Unknown'
+        preview_description = f"[PROMPT PREVIEW MODE - {prompt_type.upper()}] Campaign: {campaign_name[:50]}..."
+
+        # Append critical alerts and outreach sequences even in preview mode
+        return self._finalize_description(campaign, preview_description, precomputed)
+
+    @staticmethod
+    def _extract_content(response) -> str:
+        """Extract the raw description text from a completion response
+
+        Args:
+            response: Chat completion response
+
+        Returns:
+            Stripped description string
+        """
+        description = response.choices[0].message.content
+        if description is None:
+            return "No description generated"
+        return description.strip()
+
+    def _finalize_description(self, campaign: Union[pd.Series, Dict], description: str,
+                              precomputed: Optional[Tuple[List[str], Optional[Dict]]] = None) -> str:
+        """Append critical alerts and outreach sequences to a raw description
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+            description: Raw description text
+            precomputed: Detection results from _precompute_appends, if they
+                were already gathered while the response streamed
+
+        Returns:
+            Final description string
+        """
+        if precomputed is None:
+            precomputed = self._precompute_appends(campaign)
+        critical_fields_found, sequence_info = precomputed
+        campaign_id = campaign.get('Id', 'Unknown')
+
+        # Append alert for critical instructions if needed
+        description = self._format_critical_alert(critical_fields_found, description, campaign_id)
+
+        # Append outreach sequence if found
+        description = self._format_outreach_sequence(sequence_info, description, campaign_id)
+
+        return description
+
     def process_campaigns_batch(self, campaigns: pd.DataFrame, context_manager, batch_size: int = 10) -> pd.DataFrame:
         """Process campaigns in batches to generate AI descriptions
         
@@ -271,132 +796,583 @@ class OpenAIClient:
         Returns:
             DataFrame with AI descriptions added
         """
-        campaigns = campaigns.copy()
-        campaigns['AI_Sales_Description'] = ''
-        campaigns['AI_Prompt'] = ''
-        
+        if self.use_batch_api and self.use_openai and self.client is not None:
+            return self.process_campaigns_via_batch_api(campaigns, context_manager)
+
+        if not self.use_openai or self.client is None:
+            # Preview mode never touches the network, so the whole run can be
+            # built with column-level operations instead of the batch loop
+            return self._process_preview_vectorized(campaigns, context_manager)
+
         total_campaigns = len(campaigns)
         total_batches = (total_campaigns + batch_size - 1) // batch_size
-        
+
+        # Preallocated result arrays filled by position - attached as columns in
+        # a single assignment after all batches complete
+        descriptions = np.empty(total_campaigns, dtype=object)
+        prompt_contexts = np.empty(total_campaigns, dtype=object)
+
+        # Classify every campaign up front in one vectorized pass instead of a
+        # Python-level _get_prompt_type call per row
+        prompt_types = self._assign_prompt_types(campaigns).to_numpy()
+
+        # Materialize row dicts and outreach sequences for the whole run once -
+        # the batch loop then slices plain Python lists instead of carving
+        # DataFrame views with iloc at every batch boundary. Plain dicts are
+        # much cheaper to build than per-row Series and support the same
+        # .get() access used by the enrichment helpers; sequences come from
+        # one masked pass rather than a routing lookup per appended description
+        all_records = campaigns.to_dict('records')
+        all_sequences = context_manager.determine_outreach_sequences_batch(campaigns)
+
+        # Dispatch in prompt-type order (stable sort) so each batch carries as
+        # few distinct system prefixes as possible, maximizing server-side
+        # prompt cache hits and letting packed mode fill its groups. Results
+        # land by absolute row position, so output order is unaffected
+        dispatch_order = np.argsort(prompt_types, kind='stable')
+
         logging.info(f"Processing {total_campaigns} campaigns in batches of {batch_size}...")
-        
-        for i in range(0, total_campaigns, batch_size):
-            batch_num = (i // batch_size) + 1
-            batch_end = min(i + batch_size, total_campaigns)
-            batch = campaigns.iloc[i:batch_end]
-            
-            logging.info(f"Processing batch {batch_num}/{total_batches} ({len(batch)} campaigns)...")
-            
-            for idx, campaign in batch.iterrows():
-                # Get enriched context
-                context = context_manager.enrich_campaign_context(campaign)
-                
-                # Generate AI description
-                description, prompt = self.generate_description(campaign, context)
-                campaigns.at[idx, 'AI_Sales_Description'] = description
-                campaigns.at[idx, 'AI_Prompt'] = prompt
-                
-                # Rate limiting - adjust as needed for your OpenAI tier
-                if self.use_openai:
-                    time.sleep(0.5)
-            
-            logging.info(f"Completed batch {batch_num}/{total_batches}")
-            
-            # Log progress for large batches every 5 batches
-            if batch_num % 5 == 0 and total_batches > 5:
-                logging.info(f"Progress: {batch_num}/{total_batches} batches completed ({i + len(batch)}/{total_campaigns} campaigns)")
-        
+
+        # One event loop for the whole run - connections the async client pools
+        # during the first batch stay warm for every later batch instead of
+        # being stranded when a per-batch asyncio.run() tears its loop down
+        runner = None
+        if self.use_openai and self.async_client is not None and self.batch_prompts_per_request <= 1:
+            runner = asyncio.Runner()
+
+        try:
+            for i in range(0, total_campaigns, batch_size):
+                batch_num = (i // batch_size) + 1
+                batch_end = min(i + batch_size, total_campaigns)
+                positions = dispatch_order[i:batch_end].tolist()
+                records = [all_records[pos] for pos in positions]
+                sequences = [all_sequences[pos] for pos in positions]
+
+                logging.debug("Processing batch %d/%d (%d campaigns)...", batch_num, total_batches, len(records))
+
+                # Enrich the whole batch up front in worker threads so context
+                # building is decoupled from (and overlapped with) OpenAI I/O
+                with ThreadPoolExecutor(max_workers=min(8, len(records))) as executor:
+                    contexts = list(executor.map(context_manager.enrich_campaign_context, records))
+                prompt_contexts[positions] = contexts
+
+                if self.use_openai and self.batch_prompts_per_request > 1:
+                    # Pack several campaigns into each completion request
+                    results = self._process_batch_packed(records, contexts, positions,
+                                                         prompt_types=prompt_types,
+                                                         sequences=sequences)
+                elif runner is not None:
+                    # Fan out the whole batch concurrently, bounded by the semaphore
+                    results = runner.run(self._process_batch_async(records, contexts, positions,
+                                                                   prompt_types=prompt_types,
+                                                                   sequences=sequences))
+                else:
+                    results = []
+                    for idx, (pos, campaign, context) in enumerate(zip(positions, records, contexts)):
+                        description, prompt = self.generate_description(campaign, context,
+                                                                        prompt_type=prompt_types[pos],
+                                                                        sequence_info=sequences[idx],
+                                                                        sequence_known=True)
+                        results.append((pos, description, prompt))
+
+                for pos, description, _prompt in results:
+                    descriptions[pos] = description
+
+                logging.debug("Completed batch %d/%d", batch_num, total_batches)
+
+                # Log progress for large batches every 5 batches
+                if batch_num % 5 == 0 and total_batches > 5:
+                    logging.info("Progress: %d/%d batches completed (%d/%d campaigns)", batch_num, total_batches, batch_end, total_campaigns)
+        finally:
+            if runner is not None:
+                runner.close()
+
         logging.info(f"Successfully processed all {total_campaigns} campaigns")
-        
-        return campaigns
-    
-    def _append_critical_alert(self, campaign: pd.Series, description: str) -> str:
-        """Check for critical instruction keywords and append alert if needed
-        
+
+        # Persist newly cached responses so unchanged campaigns are free next run
+        self._save_response_cache()
+
+        # assign() returns a new frame sharing the input's column blocks, so
+        # the source data is never duplicated or mutated. The prompt is stored
+        # as (type, context) rather than the full ~2 KB assembled string per
+        # row - reconstruct_prompt rebuilds it on demand
+        return campaigns.assign(AI_Sales_Description=descriptions,
+                                AI_Prompt_Type=pd.Categorical(prompt_types),
+                                AI_Prompt_Context=prompt_contexts)
+
+    def _process_preview_vectorized(self, campaigns: pd.DataFrame, context_manager) -> pd.DataFrame:
+        """Build preview-mode output for a whole run with vectorized operations
+
+        The preview description is a pure function of prompt type and campaign
+        name, so the base column is assembled with pandas string operations in
+        one pass. Critical-keyword detection runs as a column-level regex scan,
+        and only the (typically few) flagged or sequence-routable rows fall
+        back to the per-row formatting helpers.
+
         Args:
-            campaign: Campaign data as pandas Series
-            description: AI-generated description
-            
+            campaigns: DataFrame with campaign data
+            context_manager: ContextManager instance for enriching context
+
         Returns:
-            Description with critical alert appended if needed
+            DataFrame with preview descriptions added
+        """
+        total_campaigns = len(campaigns)
+        logging.info(f"Building preview descriptions for {total_campaigns} campaigns...")
+
+        prompt_types = self._assign_prompt_types(campaigns)
+
+        if 'Name' in campaigns.columns:
+            names = campaigns['Name'].fillna('Unknown').astype(str).str.slice(0, 50)
+        else:
+            names = pd.Series('Unknown', index=campaigns.index)
+        descriptions = ('[PROMPT PREVIEW MODE - ' + prompt_types.str.upper()
+                        + '] Campaign: ' + names + '...').to_numpy(dtype=object)
+
+        # Context enrichment stays per row (it feeds AI_Prompt_Context), but
+        # runs across worker threads like the live path
+        records = campaigns.to_dict('records')
+        if records:
+            with ThreadPoolExecutor(max_workers=min(8, len(records))) as executor:
+                contexts = list(executor.map(context_manager.enrich_campaign_context, records))
+        else:
+            contexts = []
+
+        # One column-level scan per critical field; flagged rows reuse the
+        # shared formatting helper so alert text and logging stay identical
+        field_masks = {}
+        for field_name, display_name in _CRITICAL_FIELDS:
+            if field_name in campaigns.columns:
+                field_masks[display_name] = campaigns[field_name].str.contains(_CRITICAL_RE, na=False).to_numpy()
+        if field_masks:
+            any_critical = np.logical_or.reduce(list(field_masks.values()))
+            for pos in np.nonzero(any_critical)[0]:
+                critical_fields_found = [display_name for display_name, mask in field_masks.items()
+                                         if mask[pos]]
+                descriptions[pos] = self._format_critical_alert(
+                    critical_fields_found, descriptions[pos], records[pos].get('Id', 'Unknown'))
+
+        sequences = context_manager.determine_outreach_sequences_batch(campaigns)
+        for pos, sequence_info in enumerate(sequences):
+            if sequence_info:
+                descriptions[pos] = self._format_outreach_sequence(
+                    sequence_info, descriptions[pos], records[pos].get('Id', 'Unknown'))
+
+        logging.info(f"Successfully processed all {total_campaigns} campaigns")
+
+        return campaigns.assign(AI_Sales_Description=descriptions,
+                                AI_Prompt_Type=pd.Categorical(prompt_types.to_numpy()),
+                                AI_Prompt_Context=np.array(contexts, dtype=object))
+
+    async def _process_batch_async(self, records: List[Dict], contexts: List[str],
+                                   positions: Optional[List[int]] = None,
+                                   prompt_types: Optional[np.ndarray] = None,
+                                   sequences: Optional[List] = None) -> List[Tuple]:
+        """Process a batch of campaigns concurrently against the OpenAI API
+
+        Args:
+            records: Campaign rows as plain dicts
+            contexts: Pre-enriched context string for each row
+            positions: Absolute row position of each record within the full
+                campaign set (defaults to 0..len(records)-1)
+            prompt_types: Precomputed prompt types for the full campaign set
+            sequences: Precomputed outreach sequences for this batch
+
+        Returns:
+            List of (position, description, prompt) tuples
+        """
+        if positions is None:
+            positions = list(range(len(records)))
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def process_one(idx, pos, campaign, context):
+            prompt_type = prompt_types[pos] if prompt_types is not None else None
+            sequence_info = sequences[idx] if sequences is not None else None
+            description, prompt = await self._generate_description_async(campaign, context, semaphore,
+                                                                         prompt_type=prompt_type,
+                                                                         sequence_info=sequence_info,
+                                                                         sequence_known=sequences is not None)
+            return pos, description, prompt
+
+        return await asyncio.gather(*[process_one(idx, pos, campaign, context)
+                                      for idx, (pos, campaign, context)
+                                      in enumerate(zip(positions, records, contexts))])
+
+    def _process_batch_packed(self, records: List[Dict], contexts: List[str],
+                              positions: Optional[List[int]] = None,
+                              prompt_types: Optional[np.ndarray] = None,
+                              sequences: Optional[List] = None) -> List[Tuple]:
+        """Pack multiple same-type campaigns into single completion requests
+
+        Amortizes per-request overhead and RPM budget by sending up to
+        batch_prompts_per_request campaign contexts in one user message and
+        splitting the labeled response back apart. Any group whose response
+        cannot be parsed cleanly falls back to one request per campaign.
+
+        Args:
+            records: Campaign rows as plain dicts
+            contexts: Pre-enriched context string for each row
+            positions: Absolute row position of each record within the full
+                campaign set (defaults to 0..len(records)-1)
+            prompt_types: Precomputed prompt types for the full campaign set
+            sequences: Precomputed outreach sequences for this batch
+
+        Returns:
+            List of (position, description, prompt) tuples
+        """
+        if positions is None:
+            positions = list(range(len(records)))
+        results = []
+
+        def sequence_args(local_pos):
+            if sequences is None:
+                return {}
+            return {'sequence_info': sequences[local_pos], 'sequence_known': True}
+
+        # Group by prompt type so every packed request shares one instruction set
+        groups: Dict[str, List[int]] = {}
+        for local_pos, campaign in enumerate(records):
+            prompt_type = (prompt_types[positions[local_pos]] if prompt_types is not None
+                           else self._get_prompt_type(campaign))
+            groups.setdefault(prompt_type, []).append(local_pos)
+
+        for prompt_type, members in groups.items():
+            for chunk_start in range(0, len(members), self.batch_prompts_per_request):
+                chunk = members[chunk_start:chunk_start + self.batch_prompts_per_request]
+
+                if len(chunk) == 1:
+                    local_pos = chunk[0]
+                    description, prompt = self.generate_description(
+                        records[local_pos], contexts[local_pos], prompt_type=prompt_type,
+                        **sequence_args(local_pos))
+                    results.append((positions[local_pos], description, prompt))
+                    continue
+
+                packed_prompt = self._build_packed_prompt(prompt_type, [contexts[p] for p in chunk])
+                parsed = None
+                try:
+                    kwargs = self._completion_kwargs(prompt_type, packed_prompt)
+                    kwargs['max_tokens'] = 120 * len(chunk)
+                    # Packed responses separate campaign sections with blank
+                    # lines, so the single-campaign stop sequence must go
+                    del kwargs['stop']
+                    response = self.client.chat.completions.create(**kwargs)
+                    parsed = self._split_packed_response(self._extract_content(response), len(chunk))
+                except Exception as e:
+                    logging.error(f"Packed completion request failed: {e}")
+
+                if parsed is None:
+                    # Unparseable or short response - regenerate individually
+                    logging.warning(f"Falling back to single-prompt mode for {len(chunk)} campaigns")
+                    for local_pos in chunk:
+                        description, prompt = self.generate_description(
+                            records[local_pos], contexts[local_pos], prompt_type=prompt_type,
+                            **sequence_args(local_pos))
+                        results.append((positions[local_pos], description, prompt))
+                    continue
+
+                for local_pos, description in zip(chunk, parsed):
+                    campaign = records[local_pos]
+                    if self.cache_responses:
+                        cache_key = self._response_cache_key(prompt_type, contexts[local_pos])
+                        self._response_cache[cache_key] = description
+                        self._response_cache_dirty = True
+                    precomputed = None
+                    if sequences is not None:
+                        precomputed = (self._detect_critical_fields(campaign), sequences[local_pos])
+                    results.append((positions[local_pos],
+                                    self._finalize_description(campaign, description, precomputed),
+                                    packed_prompt))
+
+        return results
+
+    @staticmethod
+    def _build_packed_prompt(prompt_type: str, chunk_contexts: List[str]) -> str:
+        """Build the packed user message carrying several campaign contexts
+
+        The static instructions travel in the system message via
+        _completion_kwargs; this only assembles the numbered campaign sections.
+
+        Args:
+            prompt_type: Shared prompt type for the packed campaigns
+            chunk_contexts: Enriched context for each packed campaign
+
+        Returns:
+            Packed user message with numbered campaign sections
+        """
+        sections = '\n\n'.join(f"### CAMPAIGN {n} ###\n{context}"
+                               for n, context in enumerate(chunk_contexts, 1))
+        return (f"Generate descriptions for the following {len(chunk_contexts)} campaigns. "
+                f"For each one, produce the 3-bullet output under its matching "
+                f"'### CAMPAIGN {{number}} ###' header.\n\n{sections}")
+
+    @staticmethod
+    def _split_packed_response(content: str, expected: int) -> Optional[List[str]]:
+        """Split a packed response back into per-campaign descriptions
+
+        Args:
+            content: Raw model response for a packed request
+            expected: Number of campaign sections expected
+
+        Returns:
+            List of descriptions in campaign order, or None if the response
+            does not parse into the expected sections
+        """
+        sections = {}
+        for block in content.split('### CAMPAIGN ')[1:]:
+            header, _, body = block.partition('###')
+            try:
+                number = int(header.strip())
+            except ValueError:
+                continue
+            sections[number] = body.strip()
+
+        if set(sections) != set(range(1, expected + 1)):
+            return None
+
+        descriptions = [sections[n] for n in range(1, expected + 1)]
+        # Anything suspiciously short means the model collapsed sections
+        if any(len(description) < 40 for description in descriptions):
+            return None
+        return descriptions
+
+    def process_campaigns_via_batch_api(self, campaigns: pd.DataFrame, context_manager, poll_interval: int = 30) -> pd.DataFrame:
+        """Process campaigns through the OpenAI Batch API for large offline runs
+
+        The Batch API runs the same chat completions at 50% cost with a 24 hour
+        completion window and no per-request rate limits, which suits large
+        report generation jobs where turnaround time is not critical.
+
+        Args:
+            campaigns: DataFrame with campaign data
+            context_manager: ContextManager instance for enriching context
+            poll_interval: Seconds to wait between batch job status polls
+
+        Returns:
+            DataFrame with AI descriptions added
+        """
+        if not self.use_openai or self.client is None:
+            raise RuntimeError("Batch API processing requires OpenAI to be enabled")
+
+        total_campaigns = len(campaigns)
+
+        logging.info(f"Submitting {total_campaigns} campaigns to the OpenAI Batch API...")
+
+        # Build one request line per campaign, keyed by row position - plain
+        # dicts avoid the per-row Series boxing of iterrows, and the result
+        # arrays avoid per-cell .at writes when merging results back
+        rows = campaigns.to_dict('records')
+        prompt_types = np.empty(total_campaigns, dtype=object)
+        prompt_contexts = np.empty(total_campaigns, dtype=object)
+        descriptions = np.full(total_campaigns, 'Error generating description', dtype=object)
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.jsonl', delete=False) as batch_file:
+            for pos, campaign in enumerate(rows):
+                context = context_manager.enrich_campaign_context(campaign)
+                prompt_type = self._get_prompt_type(campaign)
+                prompt_types[pos] = prompt_type
+                prompt_contexts[pos] = context
+                request_line = {
+                    'custom_id': str(pos),
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': self._completion_kwargs(prompt_type, f"Campaign Information:\n{context}")
+                }
+                batch_file.write(json.dumps(request_line) + '\n')
+            batch_file_path = batch_file.name
+
+        try:
+            with open(batch_file_path, 'rb') as f:
+                input_file = self.client.files.create(file=f, purpose='batch')
+        finally:
+            os.unlink(batch_file_path)
+
+        batch_job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h'
+        )
+        logging.info(f"Batch job {batch_job.id} submitted - polling every {poll_interval}s...")
+
+        while batch_job.status not in ('completed', 'failed', 'expired', 'cancelled'):
+            time.sleep(poll_interval)
+            batch_job = self.client.batches.retrieve(batch_job.id)
+            logging.info(f"Batch job {batch_job.id} status: {batch_job.status}")
+
+        if batch_job.status != 'completed':
+            raise RuntimeError(f"Batch job {batch_job.id} finished with status '{batch_job.status}'")
+
+        # Merge results back by custom_id (row position), with outreach
+        # sequences for the whole run resolved in one masked pass
+        sequences = context_manager.determine_outreach_sequences_batch(campaigns)
+        output = self.client.files.content(batch_job.output_file_id)
+        for line in output.text.splitlines():
+            result = json.loads(line)
+            try:
+                pos = int(result.get('custom_id'))
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= pos < total_campaigns:
+                continue
+
+            campaign = rows[pos]
+
+            response_body = (result.get('response') or {}).get('body') or {}
+            choices = response_body.get('choices') or []
+            content = choices[0].get('message', {}).get('content') if choices else None
+            if content is None:
+                logging.error(f"No batch result content for campaign {campaign.get('Id', pos)}")
+                continue
+
+            description = content.strip() or "No description generated"
+            descriptions[pos] = self._finalize_description(
+                campaign, description, (self._detect_critical_fields(campaign), sequences[pos]))
+
+        logging.info(f"Batch job {batch_job.id} completed - {total_campaigns} campaigns processed")
+
+        return campaigns.assign(AI_Sales_Description=descriptions,
+                                AI_Prompt_Type=pd.Categorical(prompt_types),
+                                AI_Prompt_Context=prompt_contexts)
+
+    def _detect_critical_fields(self, campaign: Union[pd.Series, Dict]) -> List[str]:
+        """Find fields containing critical instruction keywords
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+
+        Returns:
+            Display names of fields with critical instructions
         """
-        # Define keywords that indicate critical instructions
-        critical_keywords = [
-            "MUST READ", "IMPORTANT", "CRITICAL", "ATTENTION", "WARNING",
-            "***", "!!!", "REQUIRED", "MANDATORY", "URGENT"
-        ]
-        
-        # Fields to check for critical instructions
-        fields_to_check = [
-            ('Description', 'Campaign Description'),
-            ('Short_Description_for_Sales__c', 'Concise Sales Summary')
-        ]
-        
         critical_fields_found = []
-        
-        for field_name, display_name in fields_to_check:
+
+        for field_name, display_name in _CRITICAL_FIELDS:
             field_value = campaign.get(field_name, '')
-            if field_value and isinstance(field_value, str):
-                field_upper = field_value.upper()
-                
-                # Check if any critical keywords are present
-                if any(keyword in field_upper for keyword in critical_keywords):
-                    critical_fields_found.append(display_name)
-                    logging.info(f"Critical instructions detected in {field_name} for campaign {campaign.get('Id', 'Unknown')}")
-        
-        # If critical instructions found, append alert
+            if field_value and isinstance(field_value, str) and _has_critical(field_value):
+                critical_fields_found.append(display_name)
+                logging.info(f"Critical instructions detected in {field_name} for campaign {campaign.get('Id', 'Unknown')}")
+
+        return critical_fields_found
+
+    @staticmethod
+    def _format_critical_alert(critical_fields_found: List[str], description: str, campaign_id) -> str:
+        """Append the critical alert line for previously detected fields
+
+        Args:
+            critical_fields_found: Display names from _detect_critical_fields
+            description: AI-generated description
+            campaign_id: Campaign Id for logging
+
+        Returns:
+            Description with critical alert appended if needed
+        """
         if critical_fields_found:
             if len(critical_fields_found) == 1:
                 alert_text = f"• [⚠️ ALERT]: Review critical handling instructions in {critical_fields_found[0]} field before proceeding"
             else:
                 fields_text = " and ".join(critical_fields_found)
                 alert_text = f"• [⚠️ ALERT]: Review critical handling instructions in {fields_text} fields before proceeding"
-            
+
             # Append the alert to the description
             description = description.rstrip() + '\n' + alert_text
-            
-            logging.info(f"Critical alert appended to campaign {campaign.get('Id', 'Unknown')}: {alert_text}")
-        
+
+            logging.info(f"Critical alert appended to campaign {campaign_id}: {alert_text}")
+
         return description
-    
-    def _append_outreach_sequence(self, campaign: pd.Series, description: str) -> str:
-        """Check for appropriate outreach sequence and append if found
-        
+
+    def _append_critical_alert(self, campaign: Union[pd.Series, Dict], description: str) -> str:
+        """Check for critical instruction keywords and append alert if needed
+
         Args:
-            campaign: Campaign data as pandas Series
+            campaign: Campaign data as pandas Series or plain dict
             description: AI-generated description
-            
+
         Returns:
-            Description with outreach sequence appended if found
+            Description with critical alert appended if needed
+        """
+        return self._format_critical_alert(self._detect_critical_fields(campaign),
+                                           description, campaign.get('Id', 'Unknown'))
+
+    def _detect_outreach_sequence(self, campaign: Union[pd.Series, Dict]) -> Optional[Dict]:
+        """Look up the outreach sequence for a campaign
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+
+        Returns:
+            Sequence info dict, or None if no sequence applies or lookup failed
         """
         try:
-            # Import here to avoid circular imports
-            from context_manager import ContextManager
-            
-            # Create context manager instance to determine outreach sequence
-            context_manager = ContextManager()
-            sequence_info = context_manager.determine_outreach_sequence(campaign)
-            
-            if sequence_info:
-                if 'sequences' in sequence_info:
-                    # Handle multiple sequences (for EE Size = 'Any')
-                    sequence_texts = []
-                    for seq in sequence_info['sequences']:
-                        sequence_texts.append(f"• [Outreach Sequence]: [{seq['name']}]({seq['url']})")
-                    sequence_text = '\n'.join(sequence_texts)
-                    description = description.rstrip() + '\n' + sequence_text
-                    
-                    logging.info(f"Multiple outreach sequences appended to campaign {campaign.get('Id', 'Unknown')}: {len(sequence_info['sequences'])} sequences")
-                else:
-                    # Handle single sequence
-                    sequence_text = f"• [Outreach Sequence]: [{sequence_info['name']}]({sequence_info['url']})"
-                    description = description.rstrip() + '\n' + sequence_text
-                    
-                    logging.info(f"Outreach sequence appended to campaign {campaign.get('Id', 'Unknown')}: {sequence_info['name']}")
-            else:
+            if self._outreach_cm is None:
+                # Import here to avoid circular imports; construct once and
+                # reuse for every subsequent campaign
+                from context_manager import ContextManager
+                self._outreach_cm = ContextManager()
+
+            sequence_info = self._outreach_cm.determine_outreach_sequence(campaign)
+            if not sequence_info:
                 logging.info(f"No outreach sequence determined for campaign {campaign.get('Id', 'Unknown')}")
-                
+                return None
+            return sequence_info
+
         except Exception as e:
             logging.error(f"Error determining outreach sequence for campaign {campaign.get('Id', 'Unknown')}: {e}")
-        
-        return description 
\ No newline at end of file
+            return None
+
+    @staticmethod
+    def _format_outreach_sequence(sequence_info: Optional[Dict], description: str, campaign_id) -> str:
+        """Append a previously looked-up outreach sequence to a description
+
+        Args:
+            sequence_info: Result of _detect_outreach_sequence
+            description: AI-generated description
+            campaign_id: Campaign Id for logging
+
+        Returns:
+            Description with outreach sequence appended if found
+        """
+        if not sequence_info:
+            return description
+
+        if 'sequences' in sequence_info:
+            # Handle multiple sequences (for EE Size = 'Any')
+            sequence_texts = []
+            for seq in sequence_info['sequences']:
+                sequence_texts.append(f"• [Outreach Sequence]: [{seq['name']}]({seq['url']})")
+            sequence_text = '\n'.join(sequence_texts)
+            description = description.rstrip() + '\n' + sequence_text
+
+            logging.info(f"Multiple outreach sequences appended to campaign {campaign_id}: {len(sequence_info['sequences'])} sequences")
+        else:
+            # Handle single sequence
+            sequence_text = f"• [Outreach Sequence]: [{sequence_info['name']}]({sequence_info['url']})"
+            description = description.rstrip() + '\n' + sequence_text
+
+            logging.info(f"Outreach sequence appended to campaign {campaign_id}: {sequence_info['name']}")
+
+        return description
+
+    def _append_outreach_sequence(self, campaign: Union[pd.Series, Dict], description: str) -> str:
+        """Check for appropriate outreach sequence and append if found
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+            description: AI-generated description
+
+        Returns:
+            Description with outreach sequence appended if found
+        """
+        return self._format_outreach_sequence(self._detect_outreach_sequence(campaign),
+                                              description, campaign.get('Id', 'Unknown'))
+
+    def _precompute_appends(self, campaign: Union[pd.Series, Dict]) -> Tuple[List[str], Optional[Dict]]:
+        """Run the detection half of the append helpers
+
+        Used to overlap critical-keyword and outreach-sequence lookups with
+        streaming network time; the results feed _finalize_description.
+
+        Args:
+            campaign: Campaign data as pandas Series or plain dict
+
+        Returns:
+            Tuple of (critical field names, outreach sequence info)
+        """
+        return self._detect_critical_fields(campaign), self._detect_outreach_sequence(campaign) 
\ No newline at end of file